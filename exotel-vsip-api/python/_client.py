@@ -1,22 +1,56 @@
 import os
 import json
+import logging
 import urllib.request
 import urllib.parse
-import sys
 import base64
+import functools
 import ssl
 
+# DEBUG_MODE=true enables request/payload debug logging. Only this module's
+# logger is configured, so importing it leaves the root logger alone.
+logger = logging.getLogger(__name__)
+if os.environ.get('DEBUG_MODE', '').lower() == 'true':
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+try:
+    import orjson
+
+    def _dumps(obj, pretty=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj, pretty=False):
+        return json.dumps(obj, indent=2 if pretty else None).encode('utf-8')
+
+    _loads = json.loads
+
+class ExotelConfigError(Exception):
+    """Required Exotel configuration is missing"""
+
+class ExotelClientError(Exception):
+    """An Exotel API request failed"""
+
+    def __init__(self, message, status_code=None, body=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
 # Build base URL from environment variables
 def get_base_url():
     domain = os.environ.get('EXO_SUBSCRIBIX_DOMAIN')
     account_sid = os.environ.get('EXO_ACCOUNT_SID')
     
     if not domain or not account_sid:
-        print("Error: Missing required environment variables (EXO_SUBSCRIBIX_DOMAIN, EXO_ACCOUNT_SID)")
-        sys.exit(1)
+        raise ExotelConfigError("Missing required environment variables (EXO_SUBSCRIBIX_DOMAIN, EXO_ACCOUNT_SID)")
     
     base_url = f"https://{domain}/v1/Accounts/{account_sid}"
-    print(f"DEBUG: Base URL: {base_url}")
+    logger.debug("Base URL: %s", base_url)
     return base_url
 
 def get_auth_header():
@@ -25,24 +59,36 @@ def get_auth_header():
     auth_token = os.environ.get('EXO_AUTH_TOKEN')
     
     if not auth_key or not auth_token:
-        print("Error: Missing required environment variables (EXO_AUTH_KEY, EXO_AUTH_TOKEN)")
-        sys.exit(1)
+        raise ExotelConfigError("Missing required environment variables (EXO_AUTH_KEY, EXO_AUTH_TOKEN)")
     
     # Create basic auth header
     credentials = f"{auth_key}:{auth_token}"
     encoded_credentials = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
     return f"Basic {encoded_credentials}"
 
-BASE = get_base_url()
+# SSL context that bypasses certificate verification, shared by all requests
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+@functools.lru_cache(maxsize=None)
+def get_settings():
+    """Return (base_url, auth_header), read from the environment on first use"""
+    return get_base_url(), get_auth_header()
 
 def post(path, payload):
-    """Make a POST request to the Exotel API"""
+    """
+    Make a POST request to the Exotel API.
+    
+    Raises ExotelConfigError if the environment is incomplete and
+    ExotelClientError if the request fails.
+    """
+    base_url, auth_header = get_settings()
     try:
-        data = json.dumps(payload).encode('utf-8')
-        auth_header = get_auth_header()
+        data = _dumps(payload)
         
         req = urllib.request.Request(
-            BASE + path, 
+            base_url + path, 
             data=data, 
             headers={
                 'Content-Type': 'application/json',
@@ -51,23 +97,17 @@ def post(path, payload):
             method='POST'
         )
         
-        print(f"DEBUG: Making request to: {BASE + path}")
-        print(f"DEBUG: Payload: {json.dumps(payload, indent=2)}")
-        
-        # Create SSL context that bypasses certificate verification
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
+        logger.debug("Making request to: %s", base_url + path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Payload: %s", _dumps(payload, pretty=True).decode('utf-8'))
         
-        with urllib.request.urlopen(req, context=ssl_context) as resp:
-            body = resp.read().decode('utf-8')
-            print(f"Response: {body}")
-            return json.loads(body)
+        with urllib.request.urlopen(req, context=_SSL_CTX) as resp:
+            body = resp.read()
+            print(f"Response: {body.decode('utf-8', errors='replace')}")
+            return _loads(body)
             
     except urllib.error.HTTPError as e:
-        print(f"HTTP Error {e.code}: {e.reason}")
-        print(e.read().decode('utf-8'))
-        sys.exit(1)
+        body = e.read().decode('utf-8')
+        raise ExotelClientError(f"HTTP {e.code} {e.reason}: {body}", status_code=e.code, body=body) from e
     except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1) 
\ No newline at end of file
+        raise ExotelClientError(f"Request failed: {e}") from e 
\ No newline at end of file
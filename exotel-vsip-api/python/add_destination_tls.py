@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from _client import post
+from _client import post, ExotelClientError, ExotelConfigError
 import os
 import sys
 
@@ -20,7 +20,11 @@ if not dest_ip or not dest_port:
 # Add TLS destination
 dest = f"{dest_ip}:{dest_port};transport=tls"
 print(f"Adding TLS destination {dest} to trunk {trunk_sid}...")
-result = post(f"/trunks/{trunk_sid}/destination-uris", {
-    'destinations': [{'destination': dest}]
-})
+try:
+    result = post(f"/trunks/{trunk_sid}/destination-uris", {
+        'destinations': [{'destination': dest}]
+    })
+except (ExotelConfigError, ExotelClientError) as e:
+    print(f"Error: {e}")
+    sys.exit(1)
 print("TLS destination added successfully!") 
\ No newline at end of file
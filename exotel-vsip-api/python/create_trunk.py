@@ -1,15 +1,27 @@
 #!/usr/bin/env python3
 
-from _client import post
+from _client import post, ExotelClientError, ExotelConfigError
 import os
+import sys
+
+# Check required environment variables
+account_sid = os.environ.get('EXO_ACCOUNT_SID')
+
+if not account_sid:
+    print("Error: EXO_ACCOUNT_SID is required. Set it in your .env file.")
+    sys.exit(1)
 
 # Create trunk with environment variables
 trunk_data = {
     'trunk_name': os.getenv('TRUNK_NAME', 'my_ai_trunk'),
     'nso_code': os.getenv('NSO_CODE', 'ANY-ANY'),
-    'domain_name': f"{os.environ['EXO_ACCOUNT_SID']}.pstn.exotel.com"
+    'domain_name': f"{account_sid}.pstn.exotel.com"
 }
 
 print("Creating trunk...")
-result = post('/trunks', trunk_data)
+try:
+    result = post('/trunks', trunk_data)
+except (ExotelConfigError, ExotelClientError) as e:
+    print(f"Error: {e}")
+    sys.exit(1)
 print("Trunk created successfully!") 
\ No newline at end of file
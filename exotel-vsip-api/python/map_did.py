@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from _client import post
+from _client import post, ExotelClientError, ExotelConfigError
 import os
 import sys
 
@@ -18,5 +18,9 @@ if not did_number:
 
 # Map DID to trunk
 print(f"Mapping DID {did_number} to trunk {trunk_sid}...")
-result = post(f"/trunks/{trunk_sid}/phone-numbers", {'phone_number': did_number})
+try:
+    result = post(f"/trunks/{trunk_sid}/phone-numbers", {'phone_number': did_number})
+except (ExotelConfigError, ExotelClientError) as e:
+    print(f"Error: {e}")
+    sys.exit(1)
 print("DID mapped successfully!") 
\ No newline at end of file
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from _client import post
+from _client import post, ExotelClientError, ExotelConfigError
 import os
 import sys
 
@@ -18,7 +18,11 @@ if not exophone:
 
 # Set trunk alias
 print(f"Setting trunk alias {exophone} for trunk {trunk_sid}...")
-result = post(f"/trunks/{trunk_sid}/settings", {
-    'settings': [{'name': 'trunk_external_alias', 'value': exophone}]
-})
+try:
+    result = post(f"/trunks/{trunk_sid}/settings", {
+        'settings': [{'name': 'trunk_external_alias', 'value': exophone}]
+    })
+except (ExotelConfigError, ExotelClientError) as e:
+    print(f"Error: {e}")
+    sys.exit(1)
 print("Trunk alias set successfully!") 
\ No newline at end of file
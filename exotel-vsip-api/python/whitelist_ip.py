@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from _client import post
+from _client import post, ExotelClientError, ExotelConfigError
 import os
 import sys
 
@@ -19,8 +19,12 @@ if not whitelist_ip:
 
 # Whitelist IP
 print(f"Whitelisting IP {whitelist_ip}/{whitelist_mask} for trunk {trunk_sid}...")
-result = post(f"/trunks/{trunk_sid}/whitelisted-ips", {
-    'ip': whitelist_ip, 
-    'mask': whitelist_mask
-})
+try:
+    result = post(f"/trunks/{trunk_sid}/whitelisted-ips", {
+        'ip': whitelist_ip, 
+        'mask': whitelist_mask
+    })
+except (ExotelConfigError, ExotelClientError) as e:
+    print(f"Error: {e}")
+    sys.exit(1)
 print("IP whitelisted successfully!") 
\ No newline at end of file
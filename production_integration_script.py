@@ -48,33 +48,160 @@ Examples:
 """
 
 import os
+import io
 import json
-import urllib.request
 import base64
-import ssl
+import hashlib
+import tempfile
+import time
+import logging
 import argparse
-import requests
-import urllib3
+import concurrent.futures
+import contextlib
+import functools
 import sys
+import threading
+import uuid
 from datetime import datetime
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+logger = logging.getLogger(__name__)
 
-# Import our outbound calling module
 try:
-    from src.exotel_outbound_calls import ExotelOutboundCaller, create_vapi_to_phone_call
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
 except ImportError:
-    # Handle import when running from different directory
-    import sys
-    import os
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
+
+# HTTP status codes that on their own mean an already-existing resource; other
+# failures (e.g. a 422 validation error) are only duplicates if error_data says so
+DUPLICATE_STATUS_CODES = frozenset({409})
+
+# error_data 'code' values meaning the resource already exists
+DUPLICATE_CODES = frozenset({1008})
+DUPLICATE_MESSAGE = 'Duplicate resource'
+
+# HTTP status codes meaning a cached trunk is gone or belongs to other credentials
+STALE_TRUNK_STATUS_CODES = (401, 404)
+
+# Active trunk SIDs persisted across runs, keyed by EXO_ACCOUNT_SID
+TRUNK_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'vapi-exotel', 'trunk_cache.json')
+TRUNK_CACHE_TTL = 3600  # seconds
+
+# (connect, read) timeouts in seconds
+EXOTEL_TIMEOUT = (3.05, 10)
+VAPI_TIMEOUT = (3.05, 15)
+
+# Upper bound on concurrent API calls; sizes the setup and batch worker pools
+# and each host's keep-alive connection pool so parallel calls find a connection
+MAX_CONCURRENT_REQUESTS = 4
+
+class ExotelAPIError(Exception):
+    """Error response from the Exotel API"""
+    
+    def __init__(self, status_code, body):
+        super().__init__(f"Exotel API Error {status_code}: {body}")
+        self.status_code = status_code
+        self.body = body
+
+def is_duplicate_error_data(error_data):
+    """Check whether an Exotel error_data object reports an already-existing resource"""
+    # Fall back to the message text for responses that carry no error code
+    return error_data.get('code') in DUPLICATE_CODES or DUPLICATE_MESSAGE in (error_data.get('message') or '')
+
+def is_duplicate_error(error):
+    """Check whether an API error means the resource already exists"""
+    if not isinstance(error, ExotelAPIError):
+        return False
+    if error.status_code in DUPLICATE_STATUS_CODES:
+        return True
+    
     try:
-        from exotel_outbound_calls import ExotelOutboundCaller, create_vapi_to_phone_call
-    except ImportError:
-        print("⚠️  Outbound calling module not found. Some features may be limited.")
-        ExotelOutboundCaller = None
-        create_vapi_to_phone_call = None
+        responses = _loads(error.body).get('response')
+    except (ValueError, AttributeError):
+        return False
+    if isinstance(responses, dict):
+        responses = [responses]
+    return any(
+        isinstance(item, dict) and is_duplicate_error_data(item.get('error_data') or {})
+        for item in responses or []
+    )
+
+class PerThreadOutput(io.TextIOBase):
+    """
+    Stand-in for sys.stdout that keeps each captured worker's prints separate.
+    
+    Functions wrapped with capture() return (result, printed_text), so concurrent
+    setup steps can report in a fixed order instead of interleaving line by line.
+    Threads that aren't capturing write straight through to the real stream.
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def capture(self, fn):
+        def run():
+            buffer = self._local.buffer = io.StringIO()
+            try:
+                result = fn()
+            except BaseException:
+                # Don't lose what the step printed before failing
+                self._stream.write(buffer.getvalue())
+                raise
+            finally:
+                del self._local.buffer
+            return result, buffer.getvalue()
+        return run
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+
+class ExotelRequestBatch:
+    """
+    Accumulates Exotel API requests and sends them together on exit.
+    
+    Each add() returns a Future that resolves with the parsed response (or raises
+    the request error) once the batch has been flushed.
+    """
+    
+    def __init__(self, integrator):
+        self.integrator = integrator
+        self._pending = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+    
+    def add(self, method, endpoint, payload=None, operation=None):
+        """Queue a request and return a Future for its result"""
+        future = concurrent.futures.Future()
+        self._pending.append((future, method, endpoint, payload, operation))
+        return future
+    
+    def flush(self):
+        """Send all queued requests concurrently over the pooled Exotel session"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        sends = [self.integrator.batch_executor.submit(self._send, *request) for request in pending]
+        concurrent.futures.wait(sends)
+    
+    def _send(self, future, method, endpoint, payload, operation):
+        try:
+            future.set_result(self.integrator.make_exotel_request(method, endpoint, payload, operation=operation))
+        except Exception as e:
+            future.set_exception(e)
 
 class VapiExotelProductionIntegrator:
     """
@@ -106,6 +233,85 @@ class VapiExotelProductionIntegrator:
     def __init__(self):
         """Initialize the integrator and load configuration from environment."""
         self.load_configuration()
+        self._active_trunk_sid = None
+        self._trunk_from_disk_cache = False
+        self._vapi_phone_index = {}
+        self._idempotency_keys = {}
+        
+        # Worker pool for the concurrent setup steps in run_complete_setup
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+        
+        # Exotel batches get their own pool: they are flushed from inside setup
+        # steps already running on self.executor, and waiting on that same pool
+        # would deadlock once every worker is busy (e.g. MAX_CONCURRENT_REQUESTS=1)
+        self.batch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+    
+    # Pooled keep-alive sessions, one per API host. They are created on first
+    # use so --validate-config and --help never import requests/urllib3.
+    @functools.cached_property
+    def vapi_session(self):
+        session = self._create_session()
+        session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': self._vapi_auth_header
+        })
+        return session
+    
+    @functools.cached_property
+    def exotel_session(self):
+        session = self._create_session()
+        session.headers.update({
+            'Content-Type': 'application/json',
+            'Authorization': self._exotel_auth_header
+        })
+        return session
+        
+    def _create_session(self):
+        """
+        Create a requests.Session with connection pooling and retries on transient errors.
+        
+        Each session talks to a single API host, so it needs one host pool holding up
+        to MAX_CONCURRENT_REQUESTS keep-alive connections. The pool blocks rather than
+        opening extra throwaway connections, so concurrent calls reuse the TLS
+        connections already established instead of paying for new handshakes.
+        """
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        class PostSafeRetry(Retry):
+            """Retry POSTs only on 429, which means the request was rejected unprocessed"""
+            
+            def is_retry(self, method, status_code, has_retry_after=False):
+                if method == 'POST':
+                    return bool(self.total) and status_code == 429
+                return super().is_retry(method, status_code, has_retry_after)
+        
+        # Disable SSL warnings
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            pool_block=True,
+            max_retries=PostSafeRetry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                # POST is left out: a 5xx or read error may arrive after the call
+                # was placed or the resource created, and neither API is known to
+                # honour Idempotency-Key. POSTs still retry on connect errors
+                # (nothing was sent) and on 429 via PostSafeRetry.
+                allowed_methods=['GET', 'PATCH'],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        session.mount('https://', adapter)
+        session.verify = False
+        return session
         
     def load_configuration(self):
         """
@@ -128,7 +334,7 @@ class VapiExotelProductionIntegrator:
         
         Integration Configuration:
         - PHONE_NUMBER: Your phone number in E.164 format (e.g., +1234567890)
-        - VAPI_FQDN: Your Vapi FQDN endpoint (e.g., your-bot@sip.vapi.ai)
+        - VAPI_FQDN: Your Vapi FQDN endpoint (e.g., your-bot@sip.vapi.ai), comma-separated for multiple
         - EXOTEL_GATEWAY_IP: Exotel gateway IP (default: 129.154.231.198)
         - EXOTEL_GATEWAY_PORT: Exotel gateway port (default: 5070)
         - TRANSPORT_TYPE: SIP transport protocol (default: tcp)
@@ -160,27 +366,52 @@ class VapiExotelProductionIntegrator:
             }
         }
         
+        exo = self.config['exotel']
+        integ = self.config['integration']
+        
+        # VAPI_FQDN may list several comma-separated endpoints
+        vapi_fqdn = integ['vapi_fqdn'] or ''
+        integ['vapi_fqdns'] = [fqdn.strip() for fqdn in vapi_fqdn.split(',') if fqdn.strip()]
+        
+        # SIP destinations depend only on config, so format them once here
+        transport = integ['transport']
+        converted_fqdns = integ['converted_fqdns'] = [self.convert_vapi_fqdn(fqdn) for fqdn in integ['vapi_fqdns']]
+        integ['sip_destinations'] = [f"{converted}:5060;transport={transport}" for converted in converted_fqdns]
+        integ['converted_fqdn'] = converted_fqdns[0] if converted_fqdns else None
+        integ['sip_destination'] = integ['sip_destinations'][0] if converted_fqdns else None
+        
         # Set Exotel base URL
-        if self.config['exotel']['domain'] and self.config['exotel']['account_sid']:
-            self.config['exotel']['base_url'] = f"https://{self.config['exotel']['domain']}/v2/accounts/{self.config['exotel']['account_sid']}"
+        if exo['domain'] and exo['account_sid']:
+            exo['base_url'] = f"https://{exo['domain']}/v2/accounts/{exo['account_sid']}"
+        self._exotel_base_url = exo['base_url']
+        self._vapi_base_url = self.config['vapi']['base_url']
+        
+        # Build the Exotel Basic auth header once instead of per request
+        credentials = f"{exo['auth_key']}:{exo['auth_token']}"
+        self._exotel_auth_header = f"Basic {base64.b64encode(credentials.encode('utf-8')).decode('utf-8')}"
+        self._vapi_auth_header = f"Bearer {self.config['vapi']['private_key']}"
     
     def validate_configuration(self):
         """Validate that all required configuration is present"""
         missing = []
+        exo = self.config['exotel']
+        vapi = self.config['vapi']
+        integ = self.config['integration']
         
-        if not self.config['exotel']['auth_key']:
+        if not exo['auth_key']:
             missing.append('EXO_AUTH_KEY')
-        if not self.config['exotel']['auth_token']:
+        if not exo['auth_token']:
             missing.append('EXO_AUTH_TOKEN')
-        if not self.config['exotel']['account_sid']:
+        if not exo['account_sid']:
             missing.append('EXO_ACCOUNT_SID')
-        if not self.config['vapi']['private_key']:
+        if not vapi['private_key']:
             missing.append('VAPI_PRIVATE_KEY')
-        if not self.config['vapi']['assistant_id']:
+        if not vapi['assistant_id']:
             missing.append('VAPI_ASSISTANT_ID')
-        if not self.config['integration']['phone_number']:
+        if not integ['phone_number']:
             missing.append('PHONE_NUMBER')
-        if not self.config['integration']['vapi_fqdn']:
+        # Checks the parsed list so a value like "," doesn't pass as a destination
+        if not integ['vapi_fqdns']:
             missing.append('VAPI_FQDN')
             
         if missing:
@@ -188,71 +419,144 @@ class VapiExotelProductionIntegrator:
             return False
         return True
     
-    def make_exotel_request(self, method, endpoint, payload=None):
-        """Make authenticated request to Exotel API v2"""
-        url = self.config['exotel']['base_url'] + endpoint
-        
-        credentials = f"{self.config['exotel']['auth_key']}:{self.config['exotel']['auth_token']}"
-        encoded_credentials = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
-        
-        headers = {
-            'Authorization': f'Basic {encoded_credentials}',
-            'Content-Type': 'application/json'
-        }
-        
-        data = json.dumps(payload).encode('utf-8') if payload else None
-        req = urllib.request.Request(url, data=data, headers=headers, method=method)
-        
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        try:
-            with urllib.request.urlopen(req, context=ssl_context) as resp:
-                return json.loads(resp.read().decode('utf-8'))
-        except urllib.error.HTTPError as e:
-            error_response = e.read().decode('utf-8')
-            raise Exception(f"Exotel API Error {e.code}: {error_response}")
-    
-    def make_vapi_request(self, method, endpoint, payload=None):
-        """Make authenticated request to Vapi API"""
-        url = self.config['vapi']['base_url'] + endpoint
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f"Bearer {self.config['vapi']['private_key']}"
-        }
+    def _idempotency_headers(self, method, operation):
+        """
+        Return an Idempotency-Key header for POSTs.
         
-        if method.upper() == 'POST':
-            response = requests.post(url, headers=headers, json=payload, verify=False)
-        elif method.upper() == 'PATCH':
-            response = requests.patch(url, headers=headers, json=payload, verify=False)
-        elif method.upper() == 'GET':
-            response = requests.get(url, headers=headers, verify=False)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
-            
-        return response
+        This is best effort only, since neither API documents honouring the header;
+        the session's retry policy is what keeps POSTs from being resent. Named operations keep the same key for the lifetime of the integrator; other
+        POSTs get a fresh key that is reused only by the transport's own retries.
+        """
+        if method != 'POST':
+            return None
+        if not operation:
+            return {'Idempotency-Key': str(uuid.uuid4())}
+        key = self._idempotency_keys.setdefault(operation, str(uuid.uuid4()))
+        return {'Idempotency-Key': key}
+    
+    def make_exotel_request(self, method, endpoint, payload=None, operation=None):
+        """Make authenticated request to Exotel API v2"""
+        method = method.upper()
+        url = self._exotel_base_url + endpoint
+        logger.debug("Exotel %s %s payload: %s", method, url, payload)
+        data = _dumps(payload) if payload is not None else None
+        response = self.exotel_session.request(
+            method, url, data=data, headers=self._idempotency_headers(method, operation), timeout=EXOTEL_TIMEOUT
+        )
+        
+        if not response.ok:
+            raise ExotelAPIError(response.status_code, response.text)
+        return _loads(response.content)
+    
+    def make_vapi_request(self, method, endpoint, payload=None, operation=None):
+        """Make authenticated request to Vapi API (any HTTP method, via the pooled session)"""
+        method = method.upper()
+        url = self._vapi_base_url + endpoint
+        logger.debug("Vapi %s %s payload: %s", method, url, payload)
+        data = _dumps(payload) if payload is not None else None
+        return self.vapi_session.request(
+            method, url, data=data, headers=self._idempotency_headers(method, operation), timeout=VAPI_TIMEOUT
+        )
     
     def convert_vapi_fqdn(self, vapi_fqdn):
         """Convert Vapi FQDN to Exotel-compatible format (@ → .)"""
         return vapi_fqdn.replace('@', '.')
     
+    def _trunk_cache_env_hash(self):
+        """Short hash of the Exotel API key so rotated credentials miss the cache"""
+        auth_key = self.config['exotel']['auth_key'] or ''
+        return hashlib.sha256(auth_key.encode('utf-8')).hexdigest()[:8]
+    
+    def _read_trunk_cache(self):
+        try:
+            with open(TRUNK_CACHE_PATH, 'rb') as f:
+                cache = _loads(f.read())
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_trunk_cache(self, cache):
+        """Write the trunk cache atomically (temp file + os.replace)"""
+        cache_dir = os.path.dirname(TRUNK_CACHE_PATH)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.trunk_cache.')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_dumps(cache))
+                os.replace(tmp_path, TRUNK_CACHE_PATH)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug("Could not write trunk cache %s: %s", TRUNK_CACHE_PATH, e)
+    
+    def _load_cached_trunk_sid(self):
+        """Return the trunk SID cached on disk for this account, if still fresh"""
+        entry = self._read_trunk_cache().get(self.config['exotel']['account_sid'])
+        if not isinstance(entry, dict):
+            return None
+        if entry.get('env_hash') != self._trunk_cache_env_hash():
+            return None
+        
+        # A hand-edited or corrupt entry is just a cache miss
+        cached_at = entry.get('cached_at')
+        trunk_sid = entry.get('trunk_sid')
+        if not isinstance(cached_at, (int, float)) or isinstance(cached_at, bool):
+            return None
+        if not isinstance(trunk_sid, str) or not trunk_sid:
+            return None
+        if time.time() - cached_at >= TRUNK_CACHE_TTL:
+            return None
+        return trunk_sid
+    
+    def _store_cached_trunk_sid(self, trunk_sid):
+        cache = self._read_trunk_cache()
+        account_sid = self.config['exotel']['account_sid']
+        if trunk_sid:
+            cache[account_sid] = {
+                'trunk_sid': trunk_sid,
+                'cached_at': time.time(),
+                'env_hash': self._trunk_cache_env_hash()
+            }
+        elif cache.pop(account_sid, None) is None:
+            return
+        self._write_trunk_cache(cache)
+    
     def get_active_trunk(self):
-        """Find an active Exotel trunk to use"""
+        """Find an active Exotel trunk to use (cached in memory and on disk per account)"""
+        if self._active_trunk_sid:
+            return self._active_trunk_sid
+        
+        cached_sid = self._load_cached_trunk_sid()
+        if cached_sid:
+            print(f"✅ Using cached active trunk: {cached_sid}")
+            self._active_trunk_sid = cached_sid
+            self._trunk_from_disk_cache = True
+            return cached_sid
+        
         print("🔍 Finding active Exotel trunk...")
         
         try:
             result = self.make_exotel_request('GET', '/trunks')
+            trunk_responses = (result or {}).get('response') or []
+            
+            # Lazily scan for the first active trunk and stop there
+            active_trunks = (
+                trunk_response['data'] for trunk_response in trunk_responses
+                if trunk_response.get('status') == 'success'
+                and trunk_response.get('data')
+                and trunk_response['data'].get('status', '').lower() == 'active'
+            )
+            trunk = next(active_trunks, None)
             
-            if result and result.get('response'):
-                for trunk_response in result['response']:
-                    if trunk_response.get('status') == 'success' and trunk_response.get('data'):
-                        trunk = trunk_response['data']
-                        if trunk.get('status', '').lower() == 'active':
-                            trunk_sid = trunk.get('trunk_sid')
-                            trunk_name = trunk.get('trunk_name', 'Unnamed')
-                            print(f"✅ Found active trunk: {trunk_name} ({trunk_sid})")
-                            return trunk_sid
+            if trunk:
+                trunk_sid = trunk.get('trunk_sid')
+                print(f"✅ Found active trunk: {trunk.get('trunk_name', 'Unnamed')} ({trunk_sid})")
+                self._active_trunk_sid = trunk_sid
+                self._trunk_from_disk_cache = False
+                self._store_cached_trunk_sid(trunk_sid)
+                return trunk_sid
             
             print("❌ No active trunk found")
             return None
@@ -261,81 +565,134 @@ class VapiExotelProductionIntegrator:
             print(f"❌ Error finding trunk: {e}")
             return None
     
-    def setup_fqdn_integration(self):
-        """Set up FQDN-based integration (Approach 1)"""
-        print("\n🎯 SETTING UP FQDN-BASED INTEGRATION")
-        print("=" * 50)
-        
-        vapi_fqdn = self.config['integration']['vapi_fqdn']
-        phone_number = self.config['integration']['phone_number']
-        
-        print(f"📋 Configuration:")
-        print(f"   FQDN: {vapi_fqdn}")
-        print(f"   Phone: {phone_number}")
-        
-        # Convert FQDN format  
-        converted_fqdn = self.convert_vapi_fqdn(vapi_fqdn)
-        sip_destination = f'{converted_fqdn}:5060;transport=tcp'
-        
-        print(f"   Converted: {converted_fqdn}")
-        print(f"   SIP Destination: {sip_destination}")
-        print()
-        
-        # Get active trunk
-        trunk_sid = self.get_active_trunk()
-        if not trunk_sid:
-            return {'success': False, 'error': 'No active trunk found'}
-        
-        # Add Vapi destination
-        print("🔄 Adding Vapi destination to trunk...")
+    def invalidate_trunk_cache(self):
+        """Forget the cached active trunk (memory and disk) so the next lookup refetches it"""
+        self._active_trunk_sid = None
+        self._trunk_from_disk_cache = False
+        self._store_cached_trunk_sid(None)
+    
+    def exotel_batch(self):
+        """Collect Exotel requests and send them together when the block exits"""
+        return ExotelRequestBatch(self)
+    
+    def check_destination_result(self, dest_request):
+        """Check the destination-uris batch result. Returns an error result on failure, None on success."""
         try:
-            dest_payload = {
-                'destinations': [{'destination': sip_destination}]
-            }
-            
-            dest_result = self.make_exotel_request('POST', f'/trunks/{trunk_sid}/destination-uris', dest_payload)
+            dest_result = dest_request.result()
             
-            if dest_result.get('response') and dest_result['response'][0].get('status') == 'success':
-                dest_data = dest_result['response'][0]['data']
-                print(f"✅ Destination added successfully! ID: {dest_data.get('id')}")
-            else:
+            # One response item per destination in the payload
+            for dest_response in dest_result.get('response') or [{}]:
+                if dest_response.get('status') == 'success':
+                    dest_data = dest_response['data']
+                    print(f"✅ Destination added successfully! ID: {dest_data.get('id')}")
+                    continue
+                
                 # Check if it's a duplicate
-                error_data = dest_result.get('response', [{}])[0].get('error_data', {})
-                if 'Duplicate resource' in error_data.get('message', ''):
+                error_data = dest_response.get('error_data', {})
+                if is_duplicate_error_data(error_data):
                     print("✅ Destination already exists (OK)")
                 else:
                     print(f"❌ Failed to add destination: {error_data.get('message')}")
                     return {'success': False, 'error': 'Failed to add destination'}
         
         except Exception as e:
-            if 'Duplicate resource' in str(e):
+            if is_duplicate_error(e):
                 print("✅ Destination already exists (OK)")
             else:
                 print(f"❌ Error adding destination: {e}")
                 return {'success': False, 'error': str(e)}
         
-        # Map phone number
-        print("🔄 Mapping phone number to trunk...")
+        return None
+    
+    def check_phone_mapping_result(self, phone_request):
+        """Check the phone-numbers batch result. Returns an error result on failure, None on success."""
         try:
-            phone_payload = {
-                'phone_number': phone_number
-            }
-            
-            phone_result = self.make_exotel_request('POST', f'/trunks/{trunk_sid}/phone-numbers', phone_payload)
+            phone_request.result()
             print("✅ Phone number mapped successfully!")
             
         except Exception as e:
-            if 'Duplicate resource' in str(e):
+            if is_duplicate_error(e):
                 print("✅ Phone number already mapped (OK)")
             else:
                 print(f"❌ Error mapping phone number: {e}")
                 return {'success': False, 'error': str(e)}
         
+        return None
+    
+    def _configure_trunk(self, trunk_sid, sip_destinations, phone_number):
+        """Send the destination and phone mapping requests for a trunk; returns their Futures"""
+        # All destinations go in a single destination-uris POST; the phone mapping
+        # targets a different trunk sub-resource and is sent alongside it
+        print("🔄 Adding Vapi destination and mapping phone number to trunk...")
+        with self.exotel_batch() as batch:
+            dest_request = batch.add('POST', f'/trunks/{trunk_sid}/destination-uris', {
+                'destinations': [{'destination': dest} for dest in sip_destinations]
+            }, operation=f'destination-uris:{trunk_sid}')
+            phone_request = batch.add('POST', f'/trunks/{trunk_sid}/phone-numbers', {
+                'phone_number': phone_number
+            }, operation=f'phone-numbers:{trunk_sid}')
+        return dest_request, phone_request
+    
+    def setup_fqdn_integration(self):
+        """Set up FQDN-based integration (Approach 1)"""
+        print("\n🎯 SETTING UP FQDN-BASED INTEGRATION")
+        print("=" * 50)
+        
+        integ = self.config['integration']
+        vapi_fqdn = integ['vapi_fqdn']
+        phone_number = integ['phone_number']
+        converted_fqdn = integ['converted_fqdn']
+        converted_fqdns = integ['converted_fqdns']
+        sip_destination = integ['sip_destination']
+        sip_destinations = integ['sip_destinations']
+        
+        print(f"📋 Configuration:")
+        print(f"   FQDN: {vapi_fqdn}")
+        print(f"   Phone: {phone_number}")
+        
+        print(f"   Converted: {', '.join(converted_fqdns)}")
+        print(f"   SIP Destination: {', '.join(sip_destinations)}")
+        print()
+        
+        # --setup-fqdn-only skips validate_configuration, so guard here too
+        if not sip_destinations:
+            print("❌ No Vapi FQDN configured - set VAPI_FQDN")
+            return {'success': False, 'error': 'No Vapi FQDN configured'}
+        
+        # Get active trunk
+        trunk_sid = self.get_active_trunk()
+        if not trunk_sid:
+            return {'success': False, 'error': 'No active trunk found'}
+        
+        dest_request, phone_request = self._configure_trunk(trunk_sid, sip_destinations, phone_number)
+        
+        # A trunk from a previous run may have been deleted since; look it up again once
+        if self._trunk_from_disk_cache and any(
+            isinstance(request.exception(), ExotelAPIError)
+            and request.exception().status_code in STALE_TRUNK_STATUS_CODES
+            for request in (dest_request, phone_request)
+        ):
+            print("⚠️  Cached trunk is no longer valid, refreshing...")
+            self.invalidate_trunk_cache()
+            trunk_sid = self.get_active_trunk()
+            if not trunk_sid:
+                return {'success': False, 'error': 'No active trunk found'}
+            dest_request, phone_request = self._configure_trunk(trunk_sid, sip_destinations, phone_number)
+        
+        dest_error = self.check_destination_result(dest_request)
+        phone_error = self.check_phone_mapping_result(phone_request)
+        
+        if dest_error:
+            return dest_error
+        if phone_error:
+            return phone_error
+        
         return {
             'success': True,
             'trunk_sid': trunk_sid,
             'fqdn': converted_fqdn,
             'sip_destination': sip_destination,
+            'sip_destinations': sip_destinations,
             'phone_number': phone_number
         }
     
@@ -344,13 +701,15 @@ class VapiExotelProductionIntegrator:
         print("\n🔄 SETTING UP BYO TRUNK INTEGRATION")
         print("=" * 50)
         
-        phone_number = self.config['integration']['phone_number']
+        integ = self.config['integration']
+        phone_number = integ['phone_number']
         assistant_id = self.config['vapi']['assistant_id']
-        gateway_ip = self.config['integration']['exotel_gateway_ip']
-        gateway_port = self.config['integration']['exotel_gateway_port']
+        gateway_ip = integ['exotel_gateway_ip']
+        gateway_port = integ['exotel_gateway_port']
+        gateway = f"{gateway_ip}:{gateway_port}"
         
         print(f"📋 Configuration:")
-        print(f"   Gateway: {gateway_ip}:{gateway_port}")
+        print(f"   Gateway: {gateway}")
         print(f"   Phone: {phone_number}")
         print(f"   Assistant: {assistant_id}")
         print()
@@ -372,10 +731,10 @@ class VapiExotelProductionIntegrator:
         }
         
         try:
-            response = self.make_vapi_request('POST', '/credential', credential_payload)
+            response = self.make_vapi_request('POST', '/credential', credential_payload, operation='credential')
             
             if response.status_code == 201:
-                credential = response.json()
+                credential = _loads(response.content)
                 credential_id = credential.get('id')
                 print(f"✅ BYO credential created: {credential_id}")
                 
@@ -390,18 +749,19 @@ class VapiExotelProductionIntegrator:
                     'assistantId': assistant_id
                 }
                 
-                phone_response = self.make_vapi_request('POST', '/phone-number', phone_payload)
+                phone_response = self.make_vapi_request('POST', '/phone-number', phone_payload, operation='phone-number')
                 
                 if phone_response.status_code == 201:
-                    phone_number_data = phone_response.json()
+                    phone_number_data = _loads(phone_response.content)
                     phone_number_id = phone_number_data.get('id')
                     print(f"✅ Phone number resource created: {phone_number_id}")
+                    self._vapi_phone_index[phone_number] = phone_number_data
                     
                     return {
                         'success': True,
                         'credential_id': credential_id,
                         'phone_number_id': phone_number_id,
-                        'gateway': f"{gateway_ip}:{gateway_port}",
+                        'gateway': gateway,
                         'phone_number': phone_number
                     }
                 else:
@@ -417,6 +777,17 @@ class VapiExotelProductionIntegrator:
             print(f"❌ Error setting up BYO trunk: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _get_vapi_phone_resource(self, number):
+        """Return the Vapi phone number resource for a number, fetching the list only on a cache miss"""
+        if number not in self._vapi_phone_index:
+            phone_list_response = self.make_vapi_request('GET', '/phone-number')
+            if phone_list_response.status_code != 200:
+                raise Exception(f"Could not retrieve phone number resources: {phone_list_response.status_code}")
+            
+            self._vapi_phone_index = {p.get('number'): p for p in _loads(phone_list_response.content)}
+        
+        return self._vapi_phone_index.get(number)
+    
     def test_integration(self):
         """Test the complete integration"""
         print("\n🧪 TESTING INTEGRATION")
@@ -433,45 +804,33 @@ class VapiExotelProductionIntegrator:
         # Test outbound call creation (if BYO is set up)
         print("🔄 Testing outbound call creation...")
         try:
-            # Try to find existing phone number resource
-            phone_list_response = self.make_vapi_request('GET', '/phone-number')
+            # Find our phone number resource
+            our_phone_resource = self._get_vapi_phone_resource(phone_number)
             
-            if phone_list_response.status_code == 200:
-                phone_numbers = phone_list_response.json()
+            if our_phone_resource:
+                phone_number_id = our_phone_resource.get('id')
                 
-                # Find our phone number
-                our_phone_resource = None
-                for phone_resource in phone_numbers:
-                    if phone_resource.get('number') == phone_number:
-                        our_phone_resource = phone_resource
-                        break
+                # Create test outbound call
+                call_payload = {
+                    'assistantId': self.config['vapi']['assistant_id'],
+                    'customer': {
+                        'number': '+1234567890',  # Test number
+                        'numberE164CheckEnabled': False
+                    },
+                    'phoneNumberId': phone_number_id
+                }
                 
-                if our_phone_resource:
-                    phone_number_id = our_phone_resource.get('id')
-                    
-                    # Create test outbound call
-                    call_payload = {
-                        'assistantId': self.config['vapi']['assistant_id'],
-                        'customer': {
-                            'number': '+1234567890',  # Test number
-                            'numberE164CheckEnabled': False
-                        },
-                        'phoneNumberId': phone_number_id
-                    }
-                    
-                    call_response = self.make_vapi_request('POST', '/call/phone', call_payload)
-                    
-                    if call_response.status_code == 201:
-                        call_data = call_response.json()
-                        call_id = call_data.get('id')
-                        print(f"✅ Test outbound call created: {call_id}")
-                        print(f"   Status: {call_data.get('status')}")
-                    else:
-                        print(f"⚠️  Outbound call test failed: {call_response.status_code}")
+                call_response = self.make_vapi_request('POST', '/call/phone', call_payload)
+                
+                if call_response.status_code == 201:
+                    call_data = _loads(call_response.content)
+                    call_id = call_data.get('id')
+                    print(f"✅ Test outbound call created: {call_id}")
+                    print(f"   Status: {call_data.get('status')}")
                 else:
-                    print("⚠️  No phone number resource found for outbound testing")
+                    print(f"⚠️  Outbound call test failed: {call_response.status_code}")
             else:
-                print("⚠️  Could not retrieve phone number resources")
+                print("⚠️  No phone number resource found for outbound testing")
                 
         except Exception as e:
             print(f"⚠️  Error testing outbound calls: {e}")
@@ -489,25 +848,48 @@ class VapiExotelProductionIntegrator:
             return {'success': False, 'error': 'Configuration validation failed'}
         
         print("✅ Configuration validated")
+        integ = self.config['integration']
         print(f"   Account: {self.config['exotel']['account_sid']}")
-        print(f"   Phone: {self.config['integration']['phone_number']}")
-        print(f"   FQDN: {self.config['integration']['vapi_fqdn']}")
+        print(f"   Phone: {integ['phone_number']}")
+        print(f"   FQDN: {integ['vapi_fqdn']}")
         print(f"   Assistant: {self.config['vapi']['assistant_id']}")
         
         results = {}
         
-        # Setup FQDN integration
-        fqdn_result = self.setup_fqdn_integration()
-        results['fqdn'] = fqdn_result
+        # Resolve the trunk first so no Vapi resources are created for an
+        # account that has nowhere to route them
+        if not self.get_active_trunk():
+            results['fqdn'] = {'success': False, 'error': 'No active trunk found'}
+            print("\n❌ FQDN setup failed, aborting before BYO trunk setup")
+            return results
+        
+        # FQDN (Exotel) and BYO (Vapi) setup are independent, run them concurrently.
+        # Each step's output is buffered and printed in order once both finish.
+        output = PerThreadOutput(sys.stdout)
+        with contextlib.redirect_stdout(output):
+            futures = {
+                self.executor.submit(output.capture(self.setup_fqdn_integration)): 'fqdn',
+                self.executor.submit(output.capture(self.setup_byo_trunk)): 'byo'
+            }
+            concurrent.futures.wait(futures)
+        
+        reports = {}
+        for future, name in futures.items():
+            results[name], reports[name] = future.result()
+        print(reports['fqdn'], end='')
+        print(reports['byo'], end='')
+        
+        fqdn_result = results['fqdn']
+        byo_result = results['byo']
         
         if not fqdn_result['success']:
-            print("\n❌ FQDN setup failed, aborting")
+            if byo_result['success']:
+                print("\n❌ FQDN setup failed, aborting (BYO trunk setup already ran;")
+                print(f"   Vapi credential {byo_result.get('credential_id')} was created)")
+            else:
+                print("\n❌ FQDN setup failed, aborting (BYO trunk setup also failed)")
             return results
         
-        # Setup BYO trunk
-        byo_result = self.setup_byo_trunk()
-        results['byo'] = byo_result
-        
         # Test integration
         test_result = self.test_integration()
         results['test'] = test_result
@@ -519,7 +901,7 @@ class VapiExotelProductionIntegrator:
         if fqdn_result['success']:
             print("✅ FQDN Integration: SUCCESS")
             print(f"   Trunk: {fqdn_result.get('trunk_sid')}")
-            print(f"   Destination: {fqdn_result.get('sip_destination')}")
+            print(f"   Destination: {', '.join(fqdn_result.get('sip_destinations') or [])}")
         
         if byo_result['success']:
             print("✅ BYO Trunk Integration: SUCCESS") 
@@ -528,7 +910,7 @@ class VapiExotelProductionIntegrator:
         
         print()
         print("🧪 READY FOR TESTING:")
-        print(f"   Call {self.config['integration']['phone_number']} right now!")
+        print(f"   Call {integ['phone_number']} right now!")
         print("   Expected: 33+ second calls with NORMAL_CLEARING")
         
         results['success'] = True
@@ -541,11 +923,20 @@ def main():
     parser.add_argument('--setup-fqdn-only', action='store_true', help='Set up FQDN integration only') 
     parser.add_argument('--test-calls', action='store_true', help='Test the integration')
     parser.add_argument('--validate-config', action='store_true', help='Validate configuration')
+    parser.add_argument('--verbose', action='store_true', help='Log API requests and payloads (or set DEBUG_MODE=true)')
+    parser.add_argument('--refresh-trunk', action='store_true',
+                        help=f'Ignore the cached active trunk and look it up again (cache: {TRUNK_CACHE_PATH})')
     
     args = parser.parse_args()
     
+    debug = args.verbose or os.environ.get('DEBUG_MODE', '').lower() == 'true'
+    logging.basicConfig(level=logging.DEBUG if debug else logging.WARNING, format='%(levelname)s: %(message)s')
+    
     integrator = VapiExotelProductionIntegrator()
     
+    if args.refresh_trunk:
+        integrator.invalidate_trunk_cache()
+    
     if args.validate_config:
         if integrator.validate_configuration():
             print("✅ Configuration is valid")
@@ -589,6 +980,9 @@ def main():
         print("  python production_integration_script.py --setup-fqdn-only")
         print("  python production_integration_script.py --test-calls")
         print("  python production_integration_script.py --validate-config")
+        print()
+        print("Add --refresh-trunk after switching your active Exotel trunk (the")
+        print(f"active trunk SID is cached for an hour in {TRUNK_CACHE_PATH})")
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
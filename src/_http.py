@@ -0,0 +1,53 @@
+"""
+Shared HTTP plumbing for the Exotel Voice v1 and v2 clients in src/
+
+Provides the JSON codec (orjson when installed, stdlib json otherwise), one
+verifying SSL context per process, and the keep-alive connection pool factory
+used by ExotelOutboundCaller and VapiExotelIntegrator.
+"""
+
+import json
+import ssl
+
+import certifi
+import urllib3
+from urllib3.util.retry import Retry
+
+# Use orjson (C extension, emits bytes directly) when available
+try:
+    import orjson
+
+    def dumps(obj, pretty=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+
+    loads = orjson.loads
+except ImportError:
+    def dumps(obj, pretty=False):
+        return json.dumps(obj, indent=2 if pretty else None).encode('utf-8')
+
+    loads = json.loads
+
+# One verifying SSL context per process, so pooled connections share the CA
+# store load and can resume TLS sessions
+SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+SSL_CTX.set_alpn_protocols(['http/1.1'])
+
+def create_pool():
+    """Create a keep-alive connection pool for Exotel API requests"""
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=16,
+        block=False,
+        retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            # POSTs are only retried on connect errors (nothing was sent yet);
+            # a read error or 5xx may come after Exotel acted on the request,
+            # and without an idempotency key a retry would repeat it
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False
+        ),
+        cert_reqs='CERT_REQUIRED',
+        ssl_context=SSL_CTX
+    )
@@ -35,7 +35,7 @@ Supported Call Patterns:
 4. **SIP Trunk Calling**: Route calls through SIP destinations
 
 Features:
-- ✅ XML Response Parsing: Handles Exotel XML responses
+- ✅ JSON Responses: Requests the .json form of Voice v1 endpoints (call listings are streamed as XML)
 - ✅ Call Recording: Optional conversation recording
 - ✅ Status Callbacks: Real-time call status updates
 - ✅ Error Handling: Comprehensive error management
@@ -54,39 +54,95 @@ Usage Examples:
     
     # Get call details
     python exotel_outbound_calls.py --call-details "call_sid_here"
+    
+    # Show call progress while dialling
+    python exotel_outbound_calls.py --connect "+1234567890" "+0987654321" --verbose
 """
 
 import os
-import json
-import urllib.request
+import logging
 import urllib.parse
 import base64
-import ssl
+import concurrent.futures
+import copy
+import functools
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
+
+# Shared JSON codec and connection pool; src/ may be imported as a package
+# or run directly from inside the directory
+if __package__:
+    from ._http import create_pool, dumps as _dumps, loads as _loads
+else:
+    from _http import create_pool, dumps as _dumps, loads as _loads
+
+# libxml2-backed iterparse when available; only used to stream call listings
+try:
+    from lxml import etree as ET
+    _LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _LXML = False
+
+_log = logging.getLogger('exotel.outbound')
+
+# Headers shared by every Voice v1 request; Authorization is added per caller
+_FORM_HEADERS = {
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'Accept-Encoding': 'gzip, deflate'
+}
 
 class ExotelOutboundCaller:
     """Handles outbound calling via Exotel Voice v1 APIs"""
     
+    # Configuration keys that must be set for any API call
+    _REQUIRED = ('api_key', 'auth_token', 'account_sid', 'domain')
+    
+    # Call statuses that will not change again, so their details can be cached
+    _TERMINAL_STATUSES = frozenset({'completed', 'failed', 'busy', 'no-answer', 'canceled'})
+    _DETAILS_CACHE_TTL = 60
+    _DETAILS_CACHE_SIZE = 1024
+    
+    # Shared keep-alive connection pool, reused by every caller in the process
+    _pool = create_pool()
+    
     def __init__(self, config: Optional[Dict] = None):
         """Initialize with configuration"""
         self.config = config or self._load_config()
         self._validate_config()
         
+        # Basic auth header is fixed for the lifetime of the caller
+        credentials = f"{self.config['api_key']}:{self.config['auth_token']}"
+        self._auth_header = 'Basic ' + base64.b64encode(credentials.encode('ascii')).decode('ascii')
+        self._url_prefix = f"https://{self.config['domain']}/v1/Accounts/{self.config['account_sid']}/"
+        
+        # Formatted flow URLs, keyed by flow_id
+        self._flow_urls = {}
+        
+        # LRU of call_sid -> (fetched_at, result) for calls in a terminal status
+        self._details_cache = OrderedDict()
+        
     def _load_config(self) -> Dict:
         """Load configuration from environment variables"""
+        # Fall back to PHONE_NUMBER (in local 0-prefixed form) only when needed
+        caller_id = os.environ.get('EXO_CALLER_ID')
+        if caller_id is None:
+            phone_number = os.environ.get('PHONE_NUMBER', '')
+            caller_id = phone_number.replace('+91', '0') if phone_number else ''
+        
         return {
             'api_key': os.environ.get('EXO_AUTH_KEY'),
             'auth_token': os.environ.get('EXO_AUTH_TOKEN'),
             'account_sid': os.environ.get('EXO_ACCOUNT_SID'),
             'domain': os.environ.get('EXO_SUBSCRIBIX_DOMAIN', 'api.in.exotel.com'),
-            'caller_id': os.environ.get('EXO_CALLER_ID', os.environ.get('PHONE_NUMBER', '').replace('+91', '0')),
+            'caller_id': caller_id,
         }
     
     def _validate_config(self):
         """Validate required configuration"""
-        required = ['api_key', 'auth_token', 'account_sid', 'domain']
-        missing = [key for key in required if not self.config.get(key)]
+        missing = tuple(key for key in self._REQUIRED if not self.config.get(key))
         
         if missing:
             raise ValueError(f"Missing required configuration: {', '.join(missing)}")
@@ -94,81 +150,58 @@ class ExotelOutboundCaller:
         if not self.config.get('caller_id'):
             raise ValueError("Missing caller_id - set EXO_CALLER_ID or PHONE_NUMBER")
     
-    def _parse_xml_response(self, xml_data: str) -> Dict:
-        """Parse XML response from Exotel API"""
-        try:
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(xml_data)
-            
-            # Find Call element
-            call_elem = root.find('Call')
-            if call_elem is not None:
-                call_data = {}
-                for child in call_elem:
-                    call_data[child.tag] = child.text
-                
-                return {'Call': call_data}
-            else:
-                return {'raw_xml': xml_data, 'parsed': True}
-                
-        except Exception as e:
-            return {'raw_xml': xml_data, 'parse_error': str(e)}
-    
-    def _make_exotel_request(self, endpoint: str, data: Dict[str, Any]) -> Dict:
-        """Make authenticated request to Exotel Voice v1 API"""
+    def _send_exotel_request(self, endpoint: str, data: Dict[str, Any], preload_content: bool = True):
+        """Send authenticated request to Exotel Voice v1 API and return the raw response"""
         
         # Build URL without auth in URL (use headers instead)
-        base_url = f"https://{self.config['domain']}"
-        url = f"{base_url}/v1/Accounts/{self.config['account_sid']}/{endpoint}"
-        
-        # Prepare basic auth header
-        credentials = f"{self.config['api_key']}:{self.config['auth_token']}"
-        encoded_credentials = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
+        url = self._url_prefix + endpoint
         
-        # Prepare form data
-        form_data = {}
+        # Prepare form data as (key, value) pairs in a single pass
+        form_data = []
+        append = form_data.append
         for key, value in data.items():
-            if isinstance(value, list):
+            if type(value) is list:
                 # Handle array parameters like StatusCallbackEvents
                 for i, item in enumerate(value):
-                    form_data[f"{key}[{i}]"] = str(item)
+                    append((f"{key}[{i}]", str(item)))
             else:
-                form_data[key] = str(value)
+                append((key, str(value)))
         
         # Encode form data
         encoded_data = urllib.parse.urlencode(form_data).encode('utf-8')
         
-        # Create request
-        req = urllib.request.Request(
-            url, 
-            data=encoded_data,
-            method='POST'
-        )
-        req.add_header('Content-Type', 'application/x-www-form-urlencoded')
-        req.add_header('Authorization', f'Basic {encoded_credentials}')
+        headers = _FORM_HEADERS.copy()
+        headers['Authorization'] = self._auth_header
         
-        # SSL context
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
+        response = self._pool.request(
+            'POST',
+            url,
+            body=encoded_data,
+            headers=headers,
+            preload_content=preload_content
+        )
+        if response.status >= 400:
+            raise Exception(f"Exotel API Error {response.status}: {response.data.decode('utf-8')}")
         
-        try:
-            with urllib.request.urlopen(req, context=ssl_context) as response:
-                response_data = response.read().decode('utf-8')
-                
-                # Try to parse as JSON first, then XML, fallback to text
-                try:
-                    return json.loads(response_data)
-                except json.JSONDecodeError:
-                    # Try to parse XML response
-                    if response_data.strip().startswith('<?xml'):
-                        return self._parse_xml_response(response_data)
-                    else:
-                        return {'raw_response': response_data, 'status': 'success'}
-                    
-        except urllib.error.HTTPError as e:
-            error_response = e.read().decode('utf-8')
-            raise Exception(f"Exotel API Error {e.code}: {error_response}")
+        return response
+    
+    def _make_exotel_request(self, endpoint: str, data: Dict[str, Any]) -> Dict:
+        """Make authenticated request to Exotel Voice v1 API"""
+        # The .json suffix makes Exotel answer in JSON instead of its default XML
+        return _loads(self._send_exotel_request(endpoint + '.json', data).data)
+    
+    @functools.cached_property
+    def e164_caller_id(self) -> str:
+        """Configured caller_id in E.164 form (+91 assumed for local numbers)"""
+        caller_id = self.config['caller_id']
+        return caller_id if caller_id.startswith('+') else '+91' + caller_id.lstrip('0')
+    
+    def _flow_url(self, flow_id: str) -> str:
+        """Return the ExoML start URL for a flow, formatting it once per flow_id"""
+        url = self._flow_urls.get(flow_id)
+        if url is None:
+            url = self._flow_urls[flow_id] = f"http://my.exotel.com/{self.config['account_sid']}/exoml/start_voice/{flow_id}"
+        return url
     
     def connect_two_numbers(
         self,
@@ -209,40 +242,25 @@ class ExotelOutboundCaller:
             'CallerId': caller_id or self.config['caller_id'],
         }
         
-        # Optional parameters
-        if record:
-            api_params['Record'] = 'true'
-            # Recording options
-            if kwargs.get('recording_channels'):
-                api_params['RecordingChannels'] = kwargs['recording_channels']
-            if kwargs.get('recording_format'):
-                api_params['RecordingFormat'] = kwargs['recording_format']
-        
-        if time_limit:
-            api_params['TimeLimit'] = time_limit
-            
-        if timeout:
-            api_params['TimeOut'] = timeout
-            
-        if wait_url:
-            api_params['WaitUrl'] = wait_url
-            
-        if custom_field:
-            api_params['CustomField'] = custom_field
-            
-        if status_callback:
-            api_params['StatusCallback'] = status_callback
-            # Add callback events if specified
-            if kwargs.get('callback_events'):
-                api_params['StatusCallbackEvents'] = kwargs['callback_events']
-            if kwargs.get('callback_content_type'):
-                api_params['StatusCallbackContentType'] = kwargs['callback_content_type']
-        
-        # Additional optional parameters
-        if kwargs.get('call_type'):
-            api_params['CallType'] = kwargs['call_type']
+        # Optional parameters; recording and callback options only apply
+        # when recording / a status callback is requested
+        get = kwargs.get
+        candidate = {
+            'Record': 'true' if record else None,
+            'RecordingChannels': get('recording_channels') if record else None,
+            'RecordingFormat': get('recording_format') if record else None,
+            'TimeLimit': time_limit,
+            'TimeOut': timeout,
+            'WaitUrl': wait_url,
+            'CustomField': custom_field,
+            'StatusCallback': status_callback,
+            'StatusCallbackEvents': get('callback_events') if status_callback else None,
+            'StatusCallbackContentType': get('callback_content_type') if status_callback else None,
+            'CallType': get('call_type'),
+        }
+        api_params.update({k: v for k, v in candidate.items() if v})
         
-        print(f"🔄 Connecting {from_number} → {to_number} via {api_params['CallerId']}")
+        _log.info("🔄 Connecting %s → %s via %s", from_number, to_number, api_params['CallerId'])
         
         try:
             result = self._make_exotel_request('Calls/connect', api_params)
@@ -252,11 +270,12 @@ class ExotelOutboundCaller:
                 call_sid = call_data.get('Sid')
                 status = call_data.get('Status')
                 
-                print(f"✅ Call initiated successfully!")
-                print(f"   Call SID: {call_sid}")
-                print(f"   Status: {status}")
-                print(f"   From: {call_data.get('From')}")
-                print(f"   To: {call_data.get('To')}")
+                if _log.isEnabledFor(logging.INFO):
+                    _log.info("✅ Call initiated successfully!")
+                    _log.info("   Call SID: %s", call_sid)
+                    _log.info("   Status: %s", status)
+                    _log.info("   From: %s", call_data.get('From'))
+                    _log.info("   To: %s", call_data.get('To'))
                 
                 return {
                     'success': True,
@@ -265,13 +284,40 @@ class ExotelOutboundCaller:
                     'call_data': call_data
                 }
             else:
-                print(f"⚠️  Unexpected response format: {result}")
+                _log.warning("⚠️  Unexpected response format: %s", result)
                 return {'success': False, 'error': 'Unexpected response format', 'response': result}
                 
         except Exception as e:
-            print(f"❌ Call failed: {e}")
+            _log.error("❌ Call failed: %s", e)
             return {'success': False, 'error': str(e)}
     
+    def connect_two_numbers_batch(
+        self,
+        list_of_pairs: List[tuple],
+        max_workers: int = 16,
+        **kwargs
+    ) -> List[Dict]:
+        """
+        Connect several (from_number, to_number) pairs concurrently
+        
+        Requests share the class connection pool, so concurrency is bounded
+        by max_workers (which should not exceed the pool's maxsize).
+        
+        Args:
+            list_of_pairs: Sequence of (from_number, to_number) tuples
+            max_workers: Maximum number of calls initiated at once
+            **kwargs: Options passed to connect_two_numbers for every pair
+            
+        Returns:
+            List of result dicts in the same order as list_of_pairs
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.connect_two_numbers, from_number, to_number, **kwargs)
+                for from_number, to_number in list_of_pairs
+            ]
+            return [future.result() for future in futures]
+    
     def connect_to_flow(
         self,
         to_number: str,
@@ -303,26 +349,23 @@ class ExotelOutboundCaller:
         api_params = {
             'From': to_number,  # The phone number to call
             'CallerId': caller_id or self.config['caller_id'],
-            'Url': f"http://my.exotel.com/{self.config['account_sid']}/exoml/start_voice/{flow_id}",
+            'Url': self._flow_url(flow_id),
         }
         
         # Add optional parameters
-        if record:
-            api_params['Record'] = 'true'
-        if custom_field:
-            api_params['CustomField'] = custom_field
-        if status_callback:
-            api_params['StatusCallback'] = status_callback
-        
-        # Additional flow parameters
-        if kwargs.get('timeout'):
-            api_params['TimeOut'] = kwargs['timeout']
-        if kwargs.get('time_limit'):
-            api_params['TimeLimit'] = kwargs['time_limit']
-        
-        print(f"🔄 Connecting {to_number} to Exotel flow {flow_id}")
-        print(f"   Flow URL: {api_params['Url']}")
-        print(f"   Caller ID: {api_params['CallerId']}")
+        candidate = {
+            'Record': 'true' if record else None,
+            'CustomField': custom_field,
+            'StatusCallback': status_callback,
+            'TimeOut': kwargs.get('timeout'),
+            'TimeLimit': kwargs.get('time_limit'),
+        }
+        api_params.update({k: v for k, v in candidate.items() if v})
+        
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("🔄 Connecting %s to Exotel flow %s", to_number, flow_id)
+            _log.info("   Flow URL: %s", api_params['Url'])
+            _log.info("   Caller ID: %s", api_params['CallerId'])
         
         try:
             result = self._make_exotel_request('Calls/connect', api_params)
@@ -332,11 +375,12 @@ class ExotelOutboundCaller:
                 call_sid = call_data.get('Sid')
                 status = call_data.get('Status')
                 
-                print(f"✅ Flow call initiated successfully!")
-                print(f"   Call SID: {call_sid}")
-                print(f"   Status: {status}")
-                print(f"   To: {call_data.get('From')}")  # Note: From/To might be swapped in response
-                print(f"   Flow ID: {flow_id}")
+                if _log.isEnabledFor(logging.INFO):
+                    _log.info("✅ Flow call initiated successfully!")
+                    _log.info("   Call SID: %s", call_sid)
+                    _log.info("   Status: %s", status)
+                    _log.info("   To: %s", call_data.get('From'))  # Note: From/To might be swapped in response
+                    _log.info("   Flow ID: %s", flow_id)
                 
                 return {
                     'success': True,
@@ -346,30 +390,80 @@ class ExotelOutboundCaller:
                     'call_data': call_data
                 }
             else:
-                print(f"⚠️  Unexpected response format: {result}")
+                _log.warning("⚠️  Unexpected response format: %s", result)
                 return {'success': False, 'error': 'Unexpected response format', 'response': result}
                 
         except Exception as e:
-            print(f"❌ Flow call failed: {e}")
+            _log.error("❌ Flow call failed: %s", e)
             return {'success': False, 'error': str(e)}
     
     def get_call_details(self, call_sid: str) -> Dict:
         """Get details of a specific call"""
+        now = time.monotonic()
+        cached = self._details_cache.get(call_sid)
+        if cached and now - cached[0] < self._DETAILS_CACHE_TTL:
+            self._details_cache.move_to_end(call_sid)
+            # Callers get their own copy, so mutating a result can't alter the cache
+            return copy.deepcopy(cached[1])
+        
         try:
             result = self._make_exotel_request(f'Calls/{call_sid}', {})
-            return {'success': True, 'call_details': result}
         except Exception as e:
             return {'success': False, 'error': str(e)}
+        
+        details = {'success': True, 'call_details': result}
+        
+        # Only finished calls are cached; live calls must always be re-polled
+        if (result.get('Call') or {}).get('Status') in self._TERMINAL_STATUSES:
+            self._details_cache[call_sid] = (now, copy.deepcopy(details))
+            self._details_cache.move_to_end(call_sid)
+            if len(self._details_cache) > self._DETAILS_CACHE_SIZE:
+                self._details_cache.popitem(last=False)
+        
+        return details
     
-    def bulk_call_details(self, date_created: Optional[str] = None) -> Dict:
-        """Get bulk call details (Beta feature)"""
+    def iter_calls(self, date_created: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream bulk call details one call at a time
+        
+        The listing is requested in Exotel's XML form and parsed incrementally
+        straight off the socket, so only one Call record is held in memory.
+        """
         params = {}
         if date_created:
             params['DateCreated'] = date_created
-            
+        
+        response = self._send_exotel_request('Calls', params, preload_content=False)
+        try:
+            if _LXML:
+                for _, elem in ET.iterparse(response, events=('end',), tag='Call'):
+                    yield {child.tag: child.text for child in elem}
+                    
+                    # Drop the parsed element and its finished siblings
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+            else:
+                # ElementTree has no parent links, so track the open elements
+                # to detach each finished Call from its parent
+                open_elems = []
+                for event, elem in ET.iterparse(response, events=('start', 'end')):
+                    if event == 'start':
+                        open_elems.append(elem)
+                        continue
+                    
+                    open_elems.pop()
+                    if elem.tag == 'Call':
+                        yield {child.tag: child.text for child in elem}
+                        if open_elems:
+                            open_elems[-1].remove(elem)
+        finally:
+            response.release_conn()
+    
+    def bulk_call_details(self, date_created: Optional[str] = None) -> Dict:
+        """Get bulk call details (Beta feature)"""
         try:
-            result = self._make_exotel_request('Calls', params)
-            return {'success': True, 'calls': result}
+            return {'success': True, 'calls': list(self.iter_calls(date_created))}
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
@@ -378,7 +472,8 @@ def create_vapi_to_phone_call(
     target_phone: str,
     from_phone: Optional[str] = None,
     record: bool = True,
-    custom_field: Optional[str] = None
+    custom_field: Optional[str] = None,
+    caller: Optional[ExotelOutboundCaller] = None
 ) -> Dict:
     """
     Create an outbound call from Vapi assistant to a phone number via Exotel
@@ -391,24 +486,24 @@ def create_vapi_to_phone_call(
         from_phone: Source phone (defaults to configured)
         record: Record the call
         custom_field: Custom tracking field
+        caller: Existing caller to reuse (a new one is built from env if omitted)
         
     Returns:
         Dict with call initiation results
     """
     
     try:
-        caller = ExotelOutboundCaller()
+        caller = caller or ExotelOutboundCaller()
         
         # Use configured phone number as 'from' if not specified
         if not from_phone:
-            from_phone = caller.config.get('caller_id')
-            if from_phone and not from_phone.startswith('+'):
-                from_phone = '+91' + from_phone.lstrip('0')
+            from_phone = caller.e164_caller_id
         
-        print(f"🤖 Initiating Vapi assistant call:")
-        print(f"   Assistant: {vapi_assistant_id}")
-        print(f"   Target: {target_phone}")
-        print(f"   From: {from_phone}")
+        if _log.isEnabledFor(logging.INFO):
+            _log.info("🤖 Initiating Vapi assistant call:")
+            _log.info("   Assistant: %s", vapi_assistant_id)
+            _log.info("   Target: %s", target_phone)
+            _log.info("   From: %s", from_phone)
         
         # Create the outbound call
         result = caller.connect_two_numbers(
@@ -422,14 +517,14 @@ def create_vapi_to_phone_call(
         )
         
         if result['success']:
-            print(f"✅ Vapi outbound call initiated: {result['call_sid']}")
+            _log.info("✅ Vapi outbound call initiated: %s", result['call_sid'])
         else:
-            print(f"❌ Vapi outbound call failed: {result.get('error')}")
+            _log.error("❌ Vapi outbound call failed: %s", result.get('error'))
             
         return result
         
     except Exception as e:
-        print(f"❌ Error creating Vapi outbound call: {e}")
+        _log.error("❌ Error creating Vapi outbound call: %s", e)
         return {'success': False, 'error': str(e)}
 
 # CLI interface
@@ -450,9 +545,15 @@ def main():
                        help='Create Vapi assistant outbound call')
     parser.add_argument('--call-details', metavar='CALL_SID', help='Get call details')
     parser.add_argument('--list-calls', action='store_true', help='List recent calls')
+    parser.add_argument('--verbose', action='store_true', help='Show call progress details')
     
     args = parser.parse_args()
     
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(message)s'
+    )
+    
     try:
         caller = ExotelOutboundCaller()
         
@@ -466,7 +567,7 @@ def main():
                 time_limit=args.time_limit,
                 custom_field=args.custom_field
             )
-            print(f"Result: {json.dumps(result, indent=2)}")
+            print(f"Result: {_dumps(result, pretty=True).decode('utf-8')}")
             
         elif args.connect_to_flow:
             phone_num, flow_id = args.connect_to_flow
@@ -476,7 +577,7 @@ def main():
                 record=args.record,
                 custom_field=args.custom_field
             )
-            print(f"Result: {json.dumps(result, indent=2)}")
+            print(f"Result: {_dumps(result, pretty=True).decode('utf-8')}")
             
         elif args.vapi_call:
             assistant_id, target_phone = args.vapi_call
@@ -484,17 +585,18 @@ def main():
                 vapi_assistant_id=assistant_id,
                 target_phone=target_phone,
                 record=args.record,
-                custom_field=args.custom_field
+                custom_field=args.custom_field,
+                caller=caller
             )
-            print(f"Result: {json.dumps(result, indent=2)}")
+            print(f"Result: {_dumps(result, pretty=True).decode('utf-8')}")
             
         elif args.call_details:
             result = caller.get_call_details(args.call_details)
-            print(f"Call Details: {json.dumps(result, indent=2)}")
+            print(f"Call Details: {_dumps(result, pretty=True).decode('utf-8')}")
             
         elif args.list_calls:
             result = caller.bulk_call_details()
-            print(f"Recent Calls: {json.dumps(result, indent=2)}")
+            print(f"Recent Calls: {_dumps(result, pretty=True).decode('utf-8')}")
             
         else:
             parser.print_help()
@@ -17,20 +17,42 @@ Requirements:
 """
 
 import os
-import json
-import urllib.request
 import base64
-import ssl
+import concurrent.futures
 import argparse
 import sys
 
+# Shared JSON codec and connection pool; src/ may be imported as a package
+# or run directly from inside the directory
+if __package__:
+    from ._http import create_pool, dumps as _dumps, loads as _loads
+else:
+    from _http import create_pool, dumps as _dumps, loads as _loads
+
+# Headers shared by every v2 request; Authorization is added per integrator
+_JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
 class VapiExotelIntegrator:
     """Handles Vapi-Exotel SIP trunk integration"""
     
+    # Shared keep-alive connection pool, reused by every integrator in the process
+    _pool = create_pool()
+    
     def __init__(self, config=None):
         self.config = config or self._load_config()
         self.base_url = f"https://{self.config['domain']}/v2/accounts/{self.config['account_sid']}"
         
+        # Basic auth header is fixed for the lifetime of the integrator
+        credentials = f"{self.config['auth_key']}:{self.config['auth_token']}"
+        self._auth_header = 'Basic ' + base64.b64encode(credentials.encode('ascii')).decode('ascii')
+        self._has_credentials = all([self.config['auth_key'], self.config['auth_token'], self.config['account_sid']])
+        
+        # Runs independent trunk sub-resource requests side by side
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        
     def _load_config(self):
         """Load configuration from environment variables"""
         return {
@@ -43,34 +65,21 @@ class VapiExotelIntegrator:
     
     def _make_request(self, method, endpoint, payload=None):
         """Make authenticated request to Exotel API"""
-        if not all([self.config['auth_key'], self.config['auth_token'], self.config['account_sid']]):
+        if not self._has_credentials:
             raise ValueError("Missing required Exotel credentials. Set EXO_AUTH_KEY, EXO_AUTH_TOKEN, and EXO_ACCOUNT_SID environment variables.")
         
         url = self.base_url + endpoint
         
-        # Create Basic Auth header
-        credentials = f"{self.config['auth_key']}:{self.config['auth_token']}"
-        encoded_credentials = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
-        
-        headers = {
-            'Authorization': f'Basic {encoded_credentials}',
-            'Content-Type': 'application/json'
-        }
-        
-        data = json.dumps(payload).encode('utf-8') if payload else None
-        req = urllib.request.Request(url, data=data, headers=headers, method=method)
+        headers = _JSON_HEADERS.copy()
+        headers['Authorization'] = self._auth_header
         
-        # SSL context (bypass verification for Exotel)
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
+        data = _dumps(payload) if payload else None
+        resp = self._pool.request(method, url, body=data, headers=headers)
         
-        try:
-            with urllib.request.urlopen(req, context=ssl_context) as resp:
-                return json.loads(resp.read().decode('utf-8'))
-        except urllib.error.HTTPError as e:
-            error_msg = e.read().decode('utf-8')
-            raise Exception(f"Exotel API Error {e.code}: {error_msg}")
+        if resp.status >= 400:
+            error_msg = resp.data.decode('utf-8')
+            raise Exception(f"Exotel API Error {resp.status}: {error_msg}")
+        return _loads(resp.data)
     
     def convert_vapi_fqdn(self, vapi_fqdn):
         """
@@ -159,19 +168,24 @@ class VapiExotelIntegrator:
             'steps': {}
         }
         
+        # Destination and phone mapping are independent trunk sub-resources,
+        # so both requests are sent at once
+        dest_future = self._executor.submit(self.add_vapi_destination, vapi_fqdn, trunk_sid)
+        phone_future = self._executor.submit(self.map_phone_number, phone_number, trunk_sid)
+        
         # Step 1: Add Vapi destination
-        dest_result = self.add_vapi_destination(vapi_fqdn, trunk_sid)
+        dest_result = dest_future.result()
         results['steps']['destination'] = dest_result
         
+        # Step 2: Map phone number
+        phone_result = phone_future.result()
+        results['steps']['phone_mapping'] = phone_result
+        
         if not dest_result['success']:
             results['success'] = False
             results['error'] = f"Failed to add destination: {dest_result['error']}"
             return results
         
-        # Step 2: Map phone number
-        phone_result = self.map_phone_number(phone_number, trunk_sid)
-        results['steps']['phone_mapping'] = phone_result
-        
         if not phone_result['success']:
             results['success'] = False
             results['error'] = f"Failed to map phone number: {phone_result['error']}"